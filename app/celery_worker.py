@@ -7,6 +7,15 @@ load_dotenv()
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
+STATS_RECONCILE_SECONDS = int(os.getenv("STATS_RECONCILE_SECONDS", 3600))
+
 celery = Celery("app", broker=REDIS_URL, backend=REDIS_URL)
 
+celery.conf.beat_schedule = {
+    "reconcile-user-stats": {
+        "task": "reconcile_user_stats_task",
+        "schedule": STATS_RECONCILE_SECONDS,
+    },
+}
+
 celery.autodiscover_tasks(["app"])
@@ -1,7 +1,11 @@
 import os
 
-import redis.asyncio as redis
+import redis
+import redis.asyncio as redis_async
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+redis_client = redis_async.from_url(REDIS_URL, decode_responses=True)
+
+# Blocking client for Celery workers, which run outside the event loop.
+redis_sync_client = redis.from_url(REDIS_URL, decode_responses=True)
@@ -4,9 +4,12 @@ from typing import Any, AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.utils.tracing import instrument_engine
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 engine = create_async_engine(DATABASE_URL, echo=True)
+instrument_engine(engine.sync_engine)
 
 AsyncSessionLocal = sessionmaker(  # type: ignore
     bind=engine,
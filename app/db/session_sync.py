@@ -3,8 +3,11 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.utils.tracing import instrument_engine
+
 DATABASE_SYNC_URL = os.getenv("DATABASE_SYNC_URL")
 
 engine = create_engine(DATABASE_SYNC_URL, echo=True)
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
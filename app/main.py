@@ -4,7 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.redis import redis_client
 from app.db.session import get_db
-from app.routes import courses, users
+from app.routes import courses, profiles, users
+from app.settings import settings
+from app.utils.profiling import profile_request
 
 app = FastAPI()
 
@@ -32,3 +34,7 @@ async def ping_redis():
 
 app.include_router(users.router, tags=["users"])
 app.include_router(courses.router, tags=["courses"])
+
+if settings.PROFILING_ENABLED:
+    app.middleware("http")(profile_request)
+    app.include_router(profiles.router, tags=["profiling"])
@@ -1,4 +1,5 @@
 from app.db.base import Base
 from app.models.user import User
 from app.models.course import Course
+from app.models.summary_variant import SummaryVariant
 
@@ -15,7 +15,14 @@ class Course(Base):
     course_title = Column(String(255), nullable=False)
     course_description = Column(Text, nullable=False)
     ai_summary = Column(Text, nullable=True)
+    ai_model = Column(String(100), nullable=True)
     status = Column(String(50), default="pending")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="courses")
+    variants = relationship(
+        "SummaryVariant",
+        back_populates="course",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
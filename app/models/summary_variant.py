@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class SummaryVariant(Base):
+    __tablename__ = "course_summary_variants"
+
+    course_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("courses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    variant = Column(String(50), primary_key=True)
+    description_hash = Column(String(64), nullable=False)
+    content = Column(Text, nullable=False)
+    ai_model = Column(String(100), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    course = relationship("Course", back_populates="variants")
+
+    __table_args__ = (
+        Index("ix_course_summary_variants_hash_variant", "description_hash", "variant"),
+    )
@@ -14,6 +14,7 @@ class User(Base):
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
+    plan = Column(String(50), nullable=False, default="free", server_default="free")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     courses = relationship(
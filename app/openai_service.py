@@ -1,43 +1,292 @@
+import json
 import logging
+import threading
+import time
+from typing import Optional
 
 import httpx
 
 from app.settings import settings
+from app.utils.tracing import start_span
 
 logger = logging.getLogger(__name__)
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 
+# Renderings of a course summary, with the instructions given to the model.
+SUMMARY_VARIANTS = {
+    "one_liner": "A single sentence of at most 25 words.",
+    "paragraph": "A short paragraph of 3 to 4 sentences.",
+    "bullets": "3 to 5 key points, one per line, each starting with '- '.",
+}
 
-def generate_course_summary_sync(course_description: str) -> str:
+# Weight of the newest observation in the moving averages below.
+HEALTH_SMOOTHING = 0.3
+
+
+class ModelHealth:
+    """
+    Per-process moving averages of upstream latency and error rate for one model.
+
+    A degraded model is probed again once ROUTING_RECOVERY_SECONDS have passed
+    since its last sample, and a successful probe restores it.
+    """
+
+    def __init__(self):
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _within_limits(self) -> bool:
+        return (
+            self.latency <= settings.ROUTING_MAX_LATENCY_SECONDS
+            and self.error_rate <= settings.ROUTING_MAX_ERROR_RATE
+        )
+
+    def record(self, latency: float, failed: bool):
+        with self._lock:
+            self.updated_at = time.monotonic()
+            if not failed and not self._within_limits():
+                # Successful probe of a degraded model: start over from it.
+                self.latency, self.error_rate = latency, 0.0
+                return
+            self.latency += HEALTH_SMOOTHING * (latency - self.latency)
+            self.error_rate += HEALTH_SMOOTHING * (float(failed) - self.error_rate)
+
+    def is_healthy(self) -> bool:
+        """
+        Whether the model should be tried first. Once the cool-off has passed,
+        a degraded model reports healthy for a single probe request.
+        """
+        with self._lock:
+            if self._within_limits():
+                return True
+            now = time.monotonic()
+            if now - self.updated_at >= settings.ROUTING_RECOVERY_SECONDS:
+                self.updated_at = now
+                return True
+            return False
+
+
+model_health: dict[str, ModelHealth] = {}
+
+
+def get_model_health(model: str) -> ModelHealth:
+    return model_health.setdefault(model, ModelHealth())
+
+
+def select_primary_model(course_description: str, plan: str = "free") -> str:
+    """
+    Pick a model from input length and the user's plan.
+
+    Short input always goes to the small model and long input to the large one.
+    Anything in between goes to the large model only for premium plans.
+    """
+    length = len(course_description)
+    if length < settings.ROUTING_SHORT_INPUT_CHARS:
+        return settings.OPENAI_SMALL_MODEL
+    if length >= settings.ROUTING_LONG_INPUT_CHARS:
+        return settings.OPENAI_MODEL
+    if plan in settings.ROUTING_PREMIUM_PLANS:
+        return settings.OPENAI_MODEL
+    return settings.OPENAI_SMALL_MODEL
+
+
+def route_models(course_description: str, plan: str = "free") -> list[str]:
+    """
+    Return the models to try in order: healthy ones first, primary before fallbacks.
+    """
+    primary = select_primary_model(course_description, plan)
+    candidates = [primary]
+    for model in [
+        settings.OPENAI_MODEL,
+        settings.OPENAI_SMALL_MODEL,
+        *settings.OPENAI_FALLBACK_MODELS,
+    ]:
+        if model not in candidates:
+            candidates.append(model)
+
+    healthy = [m for m in candidates if get_model_health(m).is_healthy()]
+    unhealthy = [m for m in candidates if m not in healthy]
+    if primary in unhealthy:
+        logger.warning(f"[OpenAI] Primary model {primary} is degraded, falling back")
+    return healthy + unhealthy
+
+
+def is_model_failure(error: Exception) -> bool:
+    """
+    Whether an error says something about the model's health. Client errors
+    such as a 400 for an oversized input are caused by the request, so only
+    429 and 5xx responses count among HTTP status errors.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        code = error.response.status_code
+        return code == 429 or code >= 500
+    return True
+
+
+def request_completion(data: dict, retries: int = 3) -> str:
+    """
+    Send a chat completion request for data["model"] and return the content.
+    Timeouts are retried up to `retries` attempts in total.
+    """
     headers = {
         "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
         "Content-Type": "application/json",
     }
 
-    data = {
-        "model": settings.OPENAI_MODEL,
-        "messages": [
-            {
-                "role": "user",
-                "content": f"Summarize this online course: {course_description}",
-            }
-        ],
-    }
-
-    for attempt in range(3):
+    model = data["model"]
+    health = get_model_health(model)
+    for attempt in range(retries):
+        started = time.monotonic()
         try:
-            with httpx.Client(timeout=30) as client:
+            with (
+                start_span(
+                    "openai.chat.completions",
+                    {"gen_ai.request.model": model, "attempt": attempt + 1},
+                ) as span,
+                httpx.Client(timeout=30) as client,
+            ):
                 response = client.post(OPENAI_API_URL, headers=headers, json=data)
+                if span is not None:
+                    span.set_attribute("http.status_code", response.status_code)
                 response.raise_for_status()
                 content = response.json()["choices"][0]["message"].get("content")
                 if not content:
                     raise ValueError("OpenAI response content is missing")
+                health.record(time.monotonic() - started, failed=False)
                 return content
         except (httpx.ReadTimeout, httpx.ConnectTimeout):
-            logger.warning(f"[OpenAI] Timeout on attempt {attempt + 1}")
-            if attempt < 2:
+            health.record(time.monotonic() - started, failed=True)
+            logger.warning(f"[OpenAI] Timeout on attempt {attempt + 1} ({model})")
+            if attempt < retries - 1:
                 continue
             raise
-        except httpx.HTTPError as e:
-            logger.error(f"[OpenAI] HTTP error: {e}")
+        except (httpx.HTTPError, ValueError) as e:
+            if is_model_failure(e):
+                health.record(time.monotonic() - started, failed=True)
+            logger.error(f"[OpenAI] HTTP error ({model}): {e}")
             raise
+
+
+def request_summary(course_description: str, model: str, retries: int = 3) -> str:
+    return request_completion(
+        {
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"Summarize this online course: {course_description}",
+                }
+            ],
+        },
+        retries,
+    )
+
+
+def request_summary_variants(
+    course_description: str, model: str, variants: list[str], retries: int = 3
+) -> dict[str, str]:
+    """
+    Request every variant in one structured-output call, so the course
+    description is sent (and billed) once.
+    """
+    instructions = "\n".join(
+        f"- {variant}: {SUMMARY_VARIANTS[variant]}" for variant in variants
+    )
+    content = request_completion(
+        {
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": (
+                        "Summarize this online course in each of the following "
+                        f"formats:\n{instructions}\n\nCourse: {course_description}"
+                    ),
+                }
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "course_summary_variants",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            variant: {"type": "string"} for variant in variants
+                        },
+                        "required": variants,
+                        "additionalProperties": False,
+                    },
+                },
+            },
+        },
+        retries,
+    )
+
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"OpenAI returned invalid JSON: {e}")
+    missing = [variant for variant in variants if not result.get(variant)]
+    if missing:
+        raise ValueError(f"OpenAI response is missing variants: {missing}")
+    return {variant: result[variant] for variant in variants}
+
+
+def call_with_fallback(course_description: str, plan: str, call):
+    """
+    Run call(model, retries) with the routed models in order until one succeeds.
+
+    Only the last candidate retries timeouts; the others hand over to the next
+    model after the first timeout so a slow primary does not stall the request.
+
+    Returns:
+        tuple: The call's result and the model that produced it.
+    """
+    models = route_models(course_description, plan)
+    for index, model in enumerate(models):
+        is_last = index == len(models) - 1
+        try:
+            return call(model, 3 if is_last else 1), model
+        except (httpx.HTTPError, ValueError):
+            if is_last:
+                raise
+            logger.warning(f"[OpenAI] {model} failed, trying {models[index + 1]}")
+
+
+def generate_course_summary_sync(
+    course_description: str, plan: str = "free"
+) -> tuple[str, str]:
+    """
+    Generate a summary with the routed model, falling back to the next model
+    when a call fails.
+
+    Returns:
+        tuple[str, str]: The summary and the model that produced it.
+    """
+    return call_with_fallback(
+        course_description,
+        plan,
+        lambda model, retries: request_summary(course_description, model, retries),
+    )
+
+
+def generate_course_summary_variants_sync(
+    course_description: str, variants: Optional[list[str]] = None, plan: str = "free"
+) -> tuple[dict[str, str], str]:
+    """
+    Generate several summary variants from a single request.
+
+    Returns:
+        tuple[dict[str, str], str]: Content per variant and the model used.
+    """
+    variants = variants or list(SUMMARY_VARIANTS)
+    return call_with_fallback(
+        course_description,
+        plan,
+        lambda model, retries: request_summary_variants(
+            course_description, model, variants, retries
+        ),
+    )
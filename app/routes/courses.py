@@ -1,25 +1,85 @@
+import math
+import time
+from collections import Counter
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.db.redis import redis_client
 from app.db.session import get_db
 from app.models.course import Course
+from app.models.summary_variant import SummaryVariant
 from app.models.user import User
+from app.openai_service import SUMMARY_VARIANTS
 from app.schemas.course import (
     CourseCreate,
     CourseOut,
+    CourseSummaryBatchGenerate,
     CourseSummaryGenerate,
     ManualSummaryUpdate,
+    SummaryBatchOut,
+    SummaryBatchProgress,
+    SummaryVariantOut,
 )
-from app.tasks.task import generate_summary_task
-from app.utils.throttle import check_throttle
+from app.settings import settings
+from app.summarizers import (
+    STATUS_COMPLETED,
+    STATUS_LOCAL,
+    STATUS_LOCAL_PREVIEW,
+    STATUS_PENDING,
+    VARIANTS_ATTEMPTS_PER_CHARGE,
+    VARIANTS_FAILED,
+    VARIANTS_FAILED_SECONDS,
+    VARIANTS_LOCK_SECONDS,
+    VARIANTS_PENDING,
+    LocalExtractiveSummarizer,
+    description_hash,
+    is_short_description,
+    parse_variants_failure,
+    upsert_variants,
+    variants_lock_key,
+)
+from app.tasks.task import generate_summary_task, generate_summary_variants_task
+from app.utils.admission import check_admission
+from app.utils.batch import create_batch, get_batch
+from app.utils.stats import (
+    COMPLETED_STATUSES,
+    record_stats,
+    status_change,
+    status_field,
+    update_course_returning_previous,
+)
+from app.utils.throttle import check_throttle, get_remaining_quota
 from app.utils.token import get_current_user
+from app.utils.tracing import TRACEPARENT_HEADER, inject, start_span
 
 router = APIRouter()
 
+# Plain columns matching CourseOut, so listings can skip ORM and Pydantic objects.
+COURSE_OUT_COLUMNS = [getattr(Course, field) for field in CourseOut.model_fields]
+
+
+class UTCORJSONResponse(ORJSONResponse):
+    """ORJSONResponse writing UTC datetimes with "Z", as Pydantic does."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def course_ids_param(course_ids: list[UUID]):
+    """
+    Bind course IDs as one expanding parameter for `id IN (...)`, so the
+    compiled statement is cached once whatever the number of IDs.
+    """
+    return bindparam("course_ids", course_ids, expanding=True)
+
 
 @router.post("/courses", response_model=CourseOut, status_code=status.HTTP_201_CREATED)
 async def create_course(
@@ -37,15 +97,20 @@ async def create_course(
     Returns:
         CourseOut: The created course with full metadata.
     """
-    new_course = Course(
-        user_id=current_user.id,
-        course_title=course_data.course_title,
-        course_description=course_data.course_description,
-        status="pending",
+    new_course = await db.scalar(
+        insert(Course)
+        .values(
+            user_id=current_user.id,
+            course_title=course_data.course_title,
+            course_description=course_data.course_description,
+            status=STATUS_PENDING,
+        )
+        .returning(Course)
     )
-    db.add(new_course)
     await db.commit()
-    await db.refresh(new_course)
+    await record_stats(
+        current_user.id, {"courses": 1, status_field(new_course.status): 1}
+    )
     return new_course
 
 
@@ -57,25 +122,200 @@ async def generate_summary(
 ):
     """
     Triggers background task to generate AI summary for a course.
-    Limited to 3 uses per user per day.
+    Limited to SUMMARY_DAILY_LIMIT uses per user per day; short descriptions
+    are summarized locally only and are not charged.
+
+    Work is rejected with 503 and Retry-After while the estimated queue wait
+    exceeds the threshold for the request's priority.
+
+    A local extractive summary is stored immediately: as the final summary for
+    short descriptions, otherwise as a placeholder until the LLM result lands.
     """
 
-    check_throttle(str(current_user.id))
+    with start_span("POST /generate_summary", {"course.id": str(data.course_id)}):
+        is_short = is_short_description(data.new_description)
+        estimated_wait = 0.0
+        if not is_short:
+            estimated_wait = await check_admission(data.priority)
+            await check_throttle(str(current_user.id))
 
-    result = await db.execute(
-        select(Course).where(
-            Course.id == data.course_id, Course.user_id == current_user.id
+        summary, model = await run_in_threadpool(
+            LocalExtractiveSummarizer().summarize, data.new_description
+        )
+        summary_status = STATUS_LOCAL if is_short else STATUS_LOCAL_PREVIEW
+        previous = (
+            await db.execute(
+                update_course_returning_previous(
+                    Course.id == data.course_id,
+                    Course.user_id == current_user.id,
+                    ai_summary=summary,
+                    ai_model=model,
+                    status=summary_status,
+                )
+            )
+        ).first()
+
+        if not previous:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        await db.commit()
+        await record_stats(
+            current_user.id, status_change(previous.status, summary_status)
         )
+
+        if is_short:
+            return {"message": "Summary generated locally", "status": summary_status}
+
+        # Trigger celery task
+        with start_span("celery.publish"):
+            generate_summary_task.apply_async(
+                args=(str(data.course_id), data.new_description, current_user.plan),
+                headers={**inject(), "enqueued_at_ns": time.time_ns()},
+            )
+
+    return {
+        "message": "Summary generation task started",
+        "status": summary_status,
+        "estimated_wait_seconds": round(estimated_wait),
+    }
+
+
+@router.post(
+    "/generate_summary/batch",
+    response_model=SummaryBatchOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_summary_batch(
+    data: CourseSummaryBatchGenerate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Regenerate summaries for many courses at once from their stored descriptions.
+
+    Ownership is verified and every course reset to "pending" with a single
+    statement, and the work is published as chunked Celery jobs, one broker
+    message per chunk. Each course counts against the daily quota, and the
+    batch is admitted with bulk priority.
+
+    Raises:
+        HTTPException: 400 if the batch is larger than BATCH_MAX_COURSES, 429 if
+            it is larger than the user's remaining daily quota.
+
+    Returns:
+        SummaryBatchOut: The batch ID to poll for progress.
+    """
+    course_ids = list(dict.fromkeys(data.course_ids))
+    if len(course_ids) > settings.BATCH_MAX_COURSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.BATCH_MAX_COURSES} courses",
+        )
+
+    remaining = await get_remaining_quota(str(current_user.id))
+    if len(course_ids) > remaining:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=(
+                f"This batch needs {len(course_ids)} summaries but only {remaining} "
+                f"of your daily limit of {settings.SUMMARY_DAILY_LIMIT} remain. "
+                "Try a smaller batch or again tomorrow."
+            ),
+        )
+
+    with start_span("POST /generate_summary/batch", {"batch.size": len(course_ids)}):
+        estimated_wait = await check_admission("bulk")
+
+        rows = (
+            await db.execute(
+                update_course_returning_previous(
+                    Course.id.in_(course_ids_param(course_ids)),
+                    Course.user_id == current_user.id,
+                    status=STATUS_PENDING,
+                ).returning(Course.id, Course.course_description)
+            )
+        ).all()
+
+        if len(rows) != len(course_ids):
+            # Undo the reset of the courses that do belong to the user.
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        await check_throttle(str(current_user.id), amount=len(course_ids))
+        await db.commit()
+
+        delta: dict[str, int] = {}
+        for row in rows:
+            for field, amount in status_change(row.status, STATUS_PENDING).items():
+                delta[field] = delta.get(field, 0) + amount
+        await record_stats(current_user.id, delta)
+
+        batch_id = await create_batch(current_user.id, course_ids)
+        # Chunk items are run by a direct call inside the chunk's task, so the
+        # trace context and each item's share of its broker message are passed
+        # as arguments: admission control measures throughput in messages.
+        chunk_size = settings.BATCH_CHUNK_SIZE
+        headers = inject()
+        items = []
+        for index, row in enumerate(rows):
+            chunk_length = min(chunk_size, len(rows) - index // chunk_size * chunk_size)
+            items.append(
+                (
+                    str(row.id),
+                    row.course_description,
+                    current_user.plan,
+                    headers.get(TRACEPARENT_HEADER),
+                    1 / chunk_length,
+                )
+            )
+        with start_span("celery.publish"):
+            generate_summary_task.chunks(items, chunk_size).group().apply_async(
+                headers=headers
+            )
+
+    return SummaryBatchOut(
+        batch_id=batch_id,
+        total=len(course_ids),
+        estimated_wait_seconds=round(estimated_wait),
     )
-    course = result.scalar_one_or_none()
 
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
 
-    # Trigger celery task
-    generate_summary_task.delay(str(course.id), data.new_description)
+@router.get("/generate_summary/batch/{batch_id}", response_model=SummaryBatchProgress)
+async def get_summary_batch_progress(
+    batch_id: UUID = Path(..., description="The UUID of the summary batch"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Report the progress of a summary batch from the current course statuses.
+
+    Courses deleted since the batch started are reported as "deleted".
+    """
+    batch = await get_batch(batch_id)
+
+    if not batch or batch["user_id"] != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Batch not found")
 
-    return {"message": "Summary generation task started"}
+    course_ids = [UUID(course_id) for course_id in batch["course_ids"]]
+    result = await db.execute(
+        select(Course.id, Course.status).where(
+            Course.id.in_(course_ids_param(course_ids)),
+            Course.user_id == current_user.id,
+        )
+    )
+    statuses = dict(result.all())
+    course_statuses = {
+        course_id: statuses.get(course_id, "deleted") for course_id in course_ids
+    }
+    status_counts = Counter(course_statuses.values())
+
+    return SummaryBatchProgress(
+        batch_id=batch_id,
+        total=len(course_ids),
+        completed=sum(status_counts[s] for s in COMPLETED_STATUSES),
+        status_counts=status_counts,
+        course_statuses=course_statuses,
+    )
 
 
 @router.get("/courses", response_model=List[CourseOut])
@@ -90,11 +330,16 @@ async def get_all_courses(
     currently logged-in user. Each course includes its title, description,
     AI-generated summary (if available), and status.
 
+    Rows are fetched as plain mappings and encoded directly with orjson; the
+    response_model is kept for the OpenAPI schema only.
+
     Returns:
         List[CourseOut]: A list of the user's courses.
     """
-    result = await db.execute(select(Course).where(Course.user_id == current_user.id))
-    return result.scalars().all()
+    result = await db.execute(
+        select(*COURSE_OUT_COLUMNS).where(Course.user_id == current_user.id)
+    )
+    return UTCORJSONResponse([dict(row) for row in result.mappings()])
 
 
 @router.get("/courses/{course_id}", response_model=CourseOut)
@@ -129,6 +374,165 @@ async def get_course(
     return course
 
 
+@router.get(
+    "/courses/{course_id}/summaries/{variant}", response_model=SummaryVariantOut
+)
+async def get_summary_variant(
+    response: Response,
+    course_id: UUID = Path(..., description="The UUID of the course"),
+    variant: str = Path(..., description="One of: " + ", ".join(SUMMARY_VARIANTS)),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retrieve a summary variant (one-liner, paragraph, bullets) of a course.
+
+    Variants are generated lazily and cached per description hash. A fresh
+    variant of this course, or one already generated for an identical
+    description, is returned directly. Otherwise all variants are generated
+    in a single background request and 202 with status "pending" is returned.
+    Each background generation counts against the daily quota and covers a
+    few retries if it fails.
+
+    Raises:
+        HTTPException: 503 with Retry-After shortly after a failed generation.
+    """
+    if variant not in SUMMARY_VARIANTS:
+        raise HTTPException(status_code=404, detail="Summary variant not found")
+
+    row = (
+        await db.execute(
+            select(
+                Course.course_description,
+                SummaryVariant.description_hash,
+                SummaryVariant.content,
+                SummaryVariant.ai_model,
+            )
+            .outerjoin(
+                SummaryVariant,
+                (SummaryVariant.course_id == Course.id)
+                & (SummaryVariant.variant == variant),
+            )
+            .where(Course.id == course_id, Course.user_id == current_user.id)
+        )
+    ).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    digest = description_hash(row.course_description)
+    if row.content and row.description_hash == digest:
+        return SummaryVariantOut(
+            course_id=course_id,
+            variant=variant,
+            status=STATUS_COMPLETED,
+            content=row.content,
+            ai_model=row.ai_model,
+        )
+
+    cached = (
+        await db.execute(
+            select(SummaryVariant.content, SummaryVariant.ai_model)
+            .where(
+                SummaryVariant.description_hash == digest,
+                SummaryVariant.variant == variant,
+            )
+            .limit(1)
+        )
+    ).first()
+    if cached:
+        # Same description summarized for another course: reuse it.
+        await db.execute(
+            upsert_variants(
+                course_id, digest, {variant: cached.content}, cached.ai_model
+            )
+        )
+        await db.commit()
+        return SummaryVariantOut(
+            course_id=course_id,
+            variant=variant,
+            status=STATUS_COMPLETED,
+            content=cached.content,
+            ai_model=cached.ai_model,
+        )
+
+    with start_span(
+        "GET /courses/{course_id}/summaries/{variant}",
+        {"course.id": str(course_id), "summary.variant": variant},
+    ):
+        attempt = await claim_variants_generation(
+            variants_lock_key(course_id, digest), str(current_user.id)
+        )
+        if attempt:
+            with start_span("celery.publish"):
+                generate_summary_variants_task.apply_async(
+                    args=(str(course_id), digest, current_user.plan, attempt),
+                    headers=inject(),
+                )
+
+    response.status_code = status.HTTP_202_ACCEPTED
+    return SummaryVariantOut(
+        course_id=course_id, variant=variant, status=STATUS_PENDING
+    )
+
+
+async def claim_variants_generation(lock_key: str, user_id: str) -> int:
+    """
+    Take the variants lock for a new generation, or for the retry of a failed
+    one once its delay has passed.
+
+    Work is admitted like any other summary job. A new generation is charged
+    to the daily quota and covers VARIANTS_ATTEMPTS_PER_CHARGE attempts;
+    retrying after that many failures is charged again. The lock is given
+    back if admission or the charge is refused.
+
+    Raises:
+        HTTPException: 503 while the queue is overloaded or the retry delay
+            runs, 429 when the quota is exhausted.
+
+    Returns:
+        int: The attempt number to enqueue, or 0 if a generation is already
+            pending.
+    """
+    marker = None
+    attempts = 0
+    if not await redis_client.set(
+        lock_key, VARIANTS_PENDING, nx=True, ex=VARIANTS_LOCK_SECONDS
+    ):
+        lock = await redis_client.get(lock_key)
+        if not lock or not lock.startswith(VARIANTS_FAILED):
+            return 0
+
+        attempts, retry_in = parse_variants_failure(lock)
+        if retry_in > 0:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Summary variant generation failed. Try again later.",
+                headers={"Retry-After": str(math.ceil(retry_in))},
+            )
+        # Only the poll that swaps the marker out enqueues the retry.
+        marker = await redis_client.set(
+            lock_key, VARIANTS_PENDING, xx=True, ex=VARIANTS_LOCK_SECONDS, get=True
+        )
+        if marker != lock:
+            return 0
+        if attempts >= VARIANTS_ATTEMPTS_PER_CHARGE:
+            attempts = 0
+
+    try:
+        await check_admission("interactive")
+        if attempts == 0:
+            await check_throttle(user_id)
+    except HTTPException:
+        if marker:
+            # Put the failure back so its attempt count is kept.
+            await redis_client.set(lock_key, marker, ex=VARIANTS_FAILED_SECONDS)
+        else:
+            await redis_client.delete(lock_key)
+        raise
+    return attempts + 1
+
+
 @router.patch("/courses/update-summary", status_code=status.HTTP_200_OK)
 async def update_course_summary(
     data: ManualSummaryUpdate,
@@ -147,19 +551,25 @@ async def update_course_summary(
         :param current_user:
         :param db:
     """
-    result = await db.execute(
-        select(Course).where(
-            Course.id == data.course_id, Course.user_id == current_user.id
+    previous = (
+        await db.execute(
+            update_course_returning_previous(
+                Course.id == data.course_id,
+                Course.user_id == current_user.id,
+                ai_summary=data.new_summary,
+                ai_model=None,
+                status=STATUS_COMPLETED,
+            )
         )
-    )
-    course = result.scalar_one_or_none()
+    ).first()
 
-    if not course:
+    if not previous:
         raise HTTPException(status_code=404, detail="Course not found")
 
-    course.ai_summary = data.new_summary
-    course.status = "completed"
     await db.commit()
+    await record_stats(
+        current_user.id, status_change(previous.status, STATUS_COMPLETED)
+    )
 
     return {"message": "AI summary updated successfully"}
 
@@ -188,13 +598,19 @@ async def delete_course(
     Returns:
         None: Responds with HTTP 204 No Content on successful deletion.
     """
-    result = await db.execute(
-        select(Course).where(Course.id == course_id, Course.user_id == current_user.id)
-    )
-    course = result.scalar_one_or_none()
+    deleted_status = (
+        await db.execute(
+            delete(Course)
+            .where(Course.id == course_id, Course.user_id == current_user.id)
+            .returning(Course.id, Course.status)
+            .execution_options(synchronize_session=False)
+        )
+    ).first()
 
-    if not course:
+    if not deleted_status:
         raise HTTPException(status_code=404, detail="Course not found")
 
-    await db.delete(course)
     await db.commit()
+    await record_stats(
+        current_user.id, {"courses": -1, status_field(deleted_status.status): -1}
+    )
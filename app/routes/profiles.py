@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from app.db.redis import redis_client
+from app.utils.profiling import profile_index_key, profile_key, require_profiling_token
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+@router.get("/profiles")
+async def list_profiles(name: str):
+    """
+    List the most recent profile ids, newest first, for a request path
+    (e.g. `/courses`) or a task (e.g. `task:generate_summary_task`).
+    """
+    profile_ids = await redis_client.lrange(profile_index_key(name), 0, -1)
+    return {"name": name, "profile_ids": profile_ids}
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """
+    Retrieve a stored request or task profile in speedscope format.
+
+    The document can be opened directly at https://www.speedscope.app.
+    """
+    report = await redis_client.get(profile_key(profile_id))
+
+    if not report:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return Response(content=report, media_type="application/json")
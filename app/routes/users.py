@@ -1,12 +1,20 @@
 from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.jwt import TokenResponse
-from app.schemas.user import PasswordChange, UserCreate, UserLogin, UserOut
+from app.schemas.user import PasswordChange, UserCreate, UserLogin, UserOut, UserStats
 from app.utils.security import decode_token, hash_password, verify_password
+from app.utils.stats import (
+    COMPLETED_STATUSES,
+    PENDING_STATUSES,
+    get_user_counters,
+    status_field,
+)
+from app.utils.throttle import get_throttle_usage, rate_limit
 from app.utils.token import generate_tokens, get_current_user
 
 router = APIRouter()
@@ -19,18 +27,20 @@ async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user and return access + refresh tokens.
     """
-    result = await db.execute(select(User).where(User.email == str(user.email)))
-    if result.scalar_one_or_none():
+    new_user = await db.scalar(
+        insert(User)
+        .values(
+            name=user.name,
+            email=str(user.email),
+            hashed_password=hash_password(user.password),
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
+    )
+    if not new_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    new_user = User(
-        name=user.name,
-        email=str(user.email),
-        hashed_password=hash_password(user.password),
-    )
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
 
     return generate_tokens(user=new_user)
 
@@ -97,3 +107,34 @@ async def get_user_details(current_user: User = Depends(get_current_user)):
     Returns the user's profile information.
     """
     return current_user
+
+
+@router.get("/users/me/stats", response_model=UserStats)
+async def get_user_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retrieve course and summary totals for the currently authenticated user.
+
+    Totals come from counters maintained as courses change, so the cost does
+    not depend on how many courses the user has.
+    """
+    counters = await get_user_counters(db, current_user.id)
+    status_counts = {
+        field.removeprefix("status:"): count
+        for field, count in counters.items()
+        if field.startswith("status:")
+    }
+    used = await get_throttle_usage(str(current_user.id))
+    return UserStats(
+        course_count=counters.get("courses", 0),
+        pending_count=sum(counters.get(status_field(s), 0) for s in PENDING_STATUSES),
+        completed_count=sum(
+            counters.get(status_field(s), 0) for s in COMPLETED_STATUSES
+        ),
+        status_counts=status_counts,
+        summaries_used_today=used,
+        summaries_remaining=max(rate_limit.amount - used, 0),
+        daily_summary_limit=rate_limit.amount,
+    )
@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class CourseCreate(BaseModel):
@@ -16,6 +16,7 @@ class CourseOut(BaseModel):
     course_title: str
     course_description: str
     ai_summary: Optional[str]
+    ai_model: Optional[str] = None
     status: str
     created_at: datetime
 
@@ -25,7 +26,41 @@ class CourseOut(BaseModel):
 
 class CourseSummaryGenerate(BaseModel):
     course_id: UUID
-    new_description: str
+    new_description: str = Field(..., min_length=1)
+    priority: Literal["interactive", "bulk"] = "interactive"
+
+    @field_validator("new_description")
+    @classmethod
+    def description_not_blank(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("new_description must not be blank")
+        return value
+
+
+class CourseSummaryBatchGenerate(BaseModel):
+    course_ids: list[UUID] = Field(..., min_length=1)
+
+
+class SummaryBatchOut(BaseModel):
+    batch_id: UUID
+    total: int
+    estimated_wait_seconds: int
+
+
+class SummaryBatchProgress(BaseModel):
+    batch_id: UUID
+    total: int
+    completed: int
+    status_counts: dict[str, int]
+    course_statuses: dict[UUID, str]
+
+
+class SummaryVariantOut(BaseModel):
+    course_id: UUID
+    variant: str
+    status: str
+    content: Optional[str] = None
+    ai_model: Optional[str] = None
 
 
 class ManualSummaryUpdate(BaseModel):
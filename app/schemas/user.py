@@ -33,6 +33,16 @@ class UserOut(BaseModel):
         from_attributes = True
 
 
+class UserStats(BaseModel):
+    course_count: int
+    pending_count: int
+    completed_count: int
+    status_counts: dict[str, int]
+    summaries_used_today: int
+    summaries_remaining: int
+    daily_summary_limit: int
+
+
 class PasswordChange(BaseModel):
     current_password: str = Field(..., min_length=6)
     new_password: str = Field(..., min_length=6)
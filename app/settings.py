@@ -19,6 +19,68 @@ class Settings:
     # openai
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    OPENAI_SMALL_MODEL: str = os.getenv("OPENAI_SMALL_MODEL", "gpt-4o-mini")
+    OPENAI_FALLBACK_MODELS: list[str] = [
+        m.strip()
+        for m in os.getenv("OPENAI_FALLBACK_MODELS", "gpt-4.1-mini").split(",")
+        if m.strip()
+    ]
+
+    # summarizers
+    SUMMARIZER_BACKEND: str = os.getenv("SUMMARIZER_BACKEND", "openai")
+    LOCAL_SUMMARY_SENTENCES: int = int(os.getenv("LOCAL_SUMMARY_SENTENCES", 3))
+    # Descriptions shorter than this are summarized locally and never sent to the LLM.
+    LOCAL_ONLY_MAX_INPUT_CHARS: int = int(os.getenv("LOCAL_ONLY_MAX_INPUT_CHARS", 400))
+
+    # model routing
+    ROUTING_SHORT_INPUT_CHARS: int = int(os.getenv("ROUTING_SHORT_INPUT_CHARS", 1500))
+    ROUTING_LONG_INPUT_CHARS: int = int(os.getenv("ROUTING_LONG_INPUT_CHARS", 6000))
+    ROUTING_PREMIUM_PLANS: list[str] = [
+        p.strip()
+        for p in os.getenv("ROUTING_PREMIUM_PLANS", "pro,team").split(",")
+        if p.strip()
+    ]
+    ROUTING_MAX_LATENCY_SECONDS: float = float(
+        os.getenv("ROUTING_MAX_LATENCY_SECONDS", 20)
+    )
+    ROUTING_MAX_ERROR_RATE: float = float(os.getenv("ROUTING_MAX_ERROR_RATE", 0.5))
+    ROUTING_RECOVERY_SECONDS: float = float(os.getenv("ROUTING_RECOVERY_SECONDS", 60))
+
+    # profiling
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_RATE: int = int(os.getenv("PROFILING_SAMPLE_RATE", 0))
+    PROFILING_INTERVAL: float = float(os.getenv("PROFILING_INTERVAL", 0.001))
+    PROFILING_TTL_SECONDS: int = int(os.getenv("PROFILING_TTL_SECONDS", 3600))
+
+    # admission control
+    CELERY_QUEUE_NAME: str = os.getenv("CELERY_QUEUE_NAME", "celery")
+    ADMISSION_MAX_WAIT_SECONDS: int = int(os.getenv("ADMISSION_MAX_WAIT_SECONDS", 300))
+    ADMISSION_BULK_MAX_WAIT_SECONDS: int = int(
+        os.getenv("ADMISSION_BULK_MAX_WAIT_SECONDS", 60)
+    )
+    ADMISSION_RATE_WINDOW_MINUTES: int = int(
+        os.getenv("ADMISSION_RATE_WINDOW_MINUTES", 5)
+    )
+    ADMISSION_MIN_THROUGHPUT: float = float(os.getenv("ADMISSION_MIN_THROUGHPUT", 0.1))
+
+    # summary quota
+    SUMMARY_DAILY_LIMIT: int = int(os.getenv("SUMMARY_DAILY_LIMIT", 3))
+
+    # batch summaries
+    # Every course in a batch is charged to the daily quota, so a batch can
+    # never be larger than SUMMARY_DAILY_LIMIT.
+    BATCH_MAX_COURSES: int = int(os.getenv("BATCH_MAX_COURSES", SUMMARY_DAILY_LIMIT))
+    BATCH_CHUNK_SIZE: int = int(os.getenv("BATCH_CHUNK_SIZE", 50))
+    BATCH_TTL_SECONDS: int = int(os.getenv("BATCH_TTL_SECONDS", 86400))
+
+    # tracing
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "")
+    TRACING_FILE_PATH: str = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+    TRACING_SERVICE_NAME: str = os.getenv(
+        "TRACING_SERVICE_NAME", "fastapi-ai-course-summarizer"
+    )
+    TRACING_FLUSH_SECONDS: float = float(os.getenv("TRACING_FLUSH_SECONDS", 1.0))
 
 
 settings = Settings()
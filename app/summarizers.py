@@ -0,0 +1,186 @@
+import hashlib
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.summary_variant import SummaryVariant
+from app.openai_service import generate_course_summary_sync
+from app.settings import settings
+
+# Course.status values for each kind of summary.
+STATUS_PENDING = "pending"
+STATUS_LOCAL_PREVIEW = "local_preview"  # local placeholder, LLM result pending
+STATUS_LOCAL = "local_completed"  # final local summary
+STATUS_COMPLETED = "completed"  # LLM or manual summary
+
+LOCAL_MODEL = "local-textrank"
+
+# Values of the per-description variants lock. A generation holds it while it
+# runs; a failed one leaves a marker with its attempt count telling polls when
+# to retry, so they neither hammer the upstream nor charge the quota each time.
+VARIANTS_PENDING = "pending"
+VARIANTS_FAILED = "failed"
+# Upper bound on one variants generation; a stuck job frees the lock after this.
+VARIANTS_LOCK_SECONDS = 300
+VARIANTS_RETRY_SECONDS = 60
+# Attempts covered by one quota charge; the next retry is charged again.
+VARIANTS_ATTEMPTS_PER_CHARGE = 3
+VARIANTS_FAILED_SECONDS = 24 * 3600
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+WORD = re.compile(r"\w+")
+
+
+class SummarizerBackend(ABC):
+    """
+    Base class for summary engines. `summarize` returns the summary and the
+    name of the model that produced it.
+    """
+
+    status: str = STATUS_COMPLETED
+
+    @abstractmethod
+    def summarize(self, course_description: str, plan: str = "free") -> tuple[str, str]:
+        """Summarize a course description."""
+
+
+class OpenAISummarizer(SummarizerBackend):
+    """Routed OpenAI chat completion; see app.openai_service."""
+
+    status = STATUS_COMPLETED
+
+    def summarize(self, course_description: str, plan: str = "free") -> tuple[str, str]:
+        return generate_course_summary_sync(course_description, plan)
+
+
+class LocalExtractiveSummarizer(SummarizerBackend):
+    """
+    TextRank-style extractive summary: sentences are ranked by PageRank over
+    their cosine similarity graph and the top ones are kept in original order.
+    Repeated sentences are ranked once, so they cannot fill the summary.
+    """
+
+    status = STATUS_LOCAL
+
+    def __init__(
+        self,
+        max_sentences: Optional[int] = None,
+        damping: float = 0.85,
+        iterations: int = 30,
+    ):
+        self.max_sentences = max_sentences or settings.LOCAL_SUMMARY_SENTENCES
+        self.damping = damping
+        self.iterations = iterations
+
+    def summarize(self, course_description: str, plan: str = "free") -> tuple[str, str]:
+        sentences = list(
+            dict.fromkeys(
+                s.strip() for s in SENTENCE_SPLIT.split(course_description) if s.strip()
+            )
+        )
+        if len(sentences) <= self.max_sentences:
+            return " ".join(sentences), LOCAL_MODEL
+
+        scores = self.rank(sentences)
+        top = np.sort(np.argsort(-scores, kind="stable")[: self.max_sentences])
+        return " ".join(sentences[i] for i in top), LOCAL_MODEL
+
+    def rank(self, sentences: list[str]) -> np.ndarray:
+        vocabulary: dict[str, int] = {}
+        rows, cols = [], []
+        for row, sentence in enumerate(sentences):
+            for word in WORD.findall(sentence.lower()):
+                rows.append(row)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+        counts = np.zeros((len(sentences), max(len(vocabulary), 1)))
+        np.add.at(counts, (rows, cols), 1.0)
+
+        norms = np.linalg.norm(counts, axis=1, keepdims=True)
+        vectors = np.divide(counts, norms, out=np.zeros_like(counts), where=norms > 0)
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.divide(
+            similarity,
+            out_weight,
+            out=np.full_like(similarity, 1.0 / len(sentences)),
+            where=out_weight > 0,
+        )
+
+        n = len(sentences)
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.iterations):
+            scores = (1 - self.damping) / n + self.damping * (transition.T @ scores)
+        return scores
+
+
+SUMMARIZERS: dict[str, type[SummarizerBackend]] = {
+    "openai": OpenAISummarizer,
+    "local": LocalExtractiveSummarizer,
+}
+
+
+def get_summarizer(name: Optional[str] = None) -> SummarizerBackend:
+    """Instantiate a registered backend, defaulting to SUMMARIZER_BACKEND."""
+    return SUMMARIZERS[name or settings.SUMMARIZER_BACKEND]()
+
+
+def is_short_description(course_description: str) -> bool:
+    """Short descriptions are summarized locally and never sent to the LLM."""
+    return len(course_description) < settings.LOCAL_ONLY_MAX_INPUT_CHARS
+
+
+def description_hash(course_description: str) -> str:
+    """Cache key for summaries of a description, shared across courses."""
+    return hashlib.sha256(course_description.encode()).hexdigest()
+
+
+def variants_lock_key(course_id, digest: str) -> str:
+    """Redis key held while variants for a course description are generated."""
+    return f"summary_variants:{course_id}:{digest}"
+
+
+def variants_failed_marker(attempt: int) -> str:
+    """
+    Lock value recording a failed generation, how many attempts it has had
+    since it was last charged, and when it may be retried.
+    """
+    return f"{VARIANTS_FAILED}:{attempt}:{time.time() + VARIANTS_RETRY_SECONDS}"
+
+
+def parse_variants_failure(lock: str) -> tuple[int, float]:
+    """Return the attempt count of a failed marker and seconds until its retry."""
+    _, attempts, retry_at = lock.split(":")
+    return int(attempts), float(retry_at) - time.time()
+
+
+def upsert_variants(course_id, digest: str, variants: dict[str, str], model: str):
+    """Build one INSERT ... ON CONFLICT storing every variant for a course."""
+    statement = insert(SummaryVariant).values(
+        [
+            {
+                "course_id": course_id,
+                "variant": variant,
+                "description_hash": digest,
+                "content": content,
+                "ai_model": model,
+            }
+            for variant, content in variants.items()
+        ]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[SummaryVariant.course_id, SummaryVariant.variant],
+        set_={
+            "description_hash": statement.excluded.description_hash,
+            "content": statement.excluded.content,
+            "ai_model": statement.excluded.ai_model,
+            "created_at": func.now(),
+        },
+    )
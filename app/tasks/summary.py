@@ -1,30 +1,132 @@
 import logging
 
+from sqlalchemy import select
+
+from app.db.redis import redis_sync_client
 from app.db.session_sync import SessionLocal
 from app.models.course import Course
-from app.openai_service import generate_course_summary_sync
+from app.openai_service import generate_course_summary_variants_sync
+from app.summarizers import (
+    VARIANTS_FAILED_SECONDS,
+    LocalExtractiveSummarizer,
+    description_hash,
+    get_summarizer,
+    is_short_description,
+    upsert_variants,
+    variants_failed_marker,
+    variants_lock_key,
+)
+from app.utils.stats import (
+    record_stats_sync,
+    status_change,
+    update_course_returning_previous,
+)
+from app.utils.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
 
-def generate_and_store_summary(course_id: str, description: str):
+def generate_and_store_summary(course_id: str, description: str, plan: str = "free"):
+    if is_short_description(description):
+        backend = LocalExtractiveSummarizer()
+    else:
+        backend = get_summarizer()
     try:
-        summary = generate_course_summary_sync(description)
+        summary, model = backend.summarize(description, plan)
+        status = backend.status
     except Exception as e:
-        logger.exception(f"[OpenAI Error] {e}")
-        return
+        logger.exception(f"[Summarizer Error] {e}")
+        # Upstream outage: keep the course usable with a local summary.
+        backend = LocalExtractiveSummarizer()
+        summary, model = backend.summarize(description, plan)
+        status = backend.status
 
     try:
-        with SessionLocal() as session:
-            course = session.query(Course).filter(Course.id == course_id).first()
+        with start_span("db.store_summary"), SessionLocal() as session:
+            previous = session.execute(
+                update_course_returning_previous(
+                    Course.id == course_id,
+                    ai_summary=summary,
+                    ai_model=model,
+                    status=status,
+                )
+            ).first()
 
-            if not course:
+            if not previous:
                 logger.warning(f"[DB] Course not found: {course_id}")
                 return
 
-            course.ai_summary = summary
-            course.status = "completed"
             session.commit()
-            logger.info(f"[DB] Summary saved/updated for course {course_id}")
+            record_stats_sync(previous.user_id, status_change(previous.status, status))
+            logger.info(
+                f"[DB] Summary saved/updated for course {course_id} using {model}"
+            )
+    except Exception as e:
+        logger.exception(f"[DB Error] {e}")
+
+
+def generate_and_store_variants(
+    course_id: str, digest: str, plan: str = "free", attempt: int = 1
+):
+    """
+    Generate every summary variant of a course's description in one request
+    and store them keyed by the description hash.
+
+    `digest` is the description hash the API locked on. The lock is released
+    once the work is done; a failed generation replaces it with a marker
+    holding `attempt`, so polls wait before retrying and only charge the
+    quota again once VARIANTS_ATTEMPTS_PER_CHARGE attempts have failed.
+    """
+    lock_key = variants_lock_key(course_id, digest)
+    done = False
+    try:
+        done = store_variants(course_id, plan)
+    finally:
+        if done:
+            # Allow a new request right away instead of after the lock expires.
+            redis_sync_client.delete(lock_key)
+        else:
+            redis_sync_client.set(
+                lock_key, variants_failed_marker(attempt), ex=VARIANTS_FAILED_SECONDS
+            )
+
+
+def store_variants(course_id: str, plan: str) -> bool:
+    """
+    Generate and store the variants of the course's current description.
+
+    Returns:
+        bool: False if the generation failed and should be retried.
+    """
+    try:
+        with SessionLocal() as session:
+            description = session.scalar(
+                select(Course.course_description).where(Course.id == course_id)
+            )
+    except Exception as e:
+        logger.exception(f"[DB Error] {e}")
+        return False
+
+    if description is None:
+        logger.warning(f"[DB] Course not found: {course_id}")
+        return True
+
+    try:
+        variants, model = generate_course_summary_variants_sync(description, plan=plan)
+    except Exception as e:
+        logger.exception(f"[OpenAI Error] {e}")
+        return False
+
+    try:
+        with start_span("db.store_variants"), SessionLocal() as session:
+            session.execute(
+                upsert_variants(
+                    course_id, description_hash(description), variants, model
+                )
+            )
+            session.commit()
+            logger.info(f"[DB] Summary variants saved for course {course_id}")
     except Exception as e:
         logger.exception(f"[DB Error] {e}")
+        return False
+    return True
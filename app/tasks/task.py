@@ -1,7 +1,78 @@
+import logging
+from typing import Optional
+
 from app.celery_worker import celery
-from app.tasks.summary import generate_and_store_summary
+from app.db.session_sync import SessionLocal
+from app.tasks.summary import generate_and_store_summary, generate_and_store_variants
+from app.utils.admission import record_completion
+from app.utils.profiling import profiled_task
+from app.utils.stats import reconcile_all
+from app.utils.tracing import TRACEPARENT_HEADER, begin_span, start_span
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name="generate_summary_task", bind=True)
+@profiled_task
+def generate_summary_task(
+    self,
+    course_id: str,
+    description: str,
+    plan: str = "free",
+    traceparent: Optional[str] = None,
+    completion_weight: float = 1.0,
+):
+    """
+    Generate and store a course summary.
+
+    Batch items arrive through Celery chunks, which call this task directly
+    without its own message headers: they pass the trace context as
+    `traceparent` and their share of the chunk message as `completion_weight`.
+    """
+    traceparent = self.request.get(TRACEPARENT_HEADER) or traceparent
+    enqueued_at_ns = self.request.get("enqueued_at_ns")
+
+    if enqueued_at_ns:
+        # Broker wait: from publish in the API to pickup by this worker.
+        queue_span = begin_span(
+            "celery.queue", traceparent=traceparent, start_ns=enqueued_at_ns
+        )
+        if queue_span is not None:
+            queue_span.end()
+
+    with start_span(
+        "generate_summary_task",
+        {"course.id": course_id, "celery.task_id": self.request.id},
+        traceparent=traceparent,
+    ):
+        try:
+            generate_and_store_summary(course_id, description, plan)
+        finally:
+            record_completion(completion_weight)
+
+
+@celery.task(name="generate_summary_variants_task", bind=True)
+@profiled_task
+def generate_summary_variants_task(
+    self, course_id: str, digest: str, plan: str = "free", attempt: int = 1
+):
+    with start_span(
+        "generate_summary_variants_task",
+        {
+            "course.id": course_id,
+            "celery.task_id": self.request.id,
+            "attempt": attempt,
+        },
+        traceparent=self.request.get(TRACEPARENT_HEADER),
+    ):
+        try:
+            generate_and_store_variants(course_id, digest, plan, attempt)
+        finally:
+            record_completion()
 
 
-@celery.task(name="generate_summary_task")
-def generate_summary_task(course_id: str, description: str):
-    generate_and_store_summary(course_id, description)
+@celery.task(name="reconcile_user_stats_task")
+def reconcile_user_stats_task():
+    with SessionLocal() as session:
+        users = reconcile_all(session)
+    logger.info(f"[Stats] Reconciled counters for {users} users")
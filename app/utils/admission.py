@@ -0,0 +1,114 @@
+import logging
+import math
+import time
+
+from fastapi import HTTPException, status
+
+from app.db.redis import redis_client, redis_sync_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+COMPLETIONS_KEY = "summary:completed:{}"
+# Completion rate measured over the last fully active window, kept across idle periods.
+THROUGHPUT_KEY = "summary:throughput"
+
+
+def completion_keys(now: float) -> list[str]:
+    """Per-minute completion counter keys covering the rate window."""
+    minute = int(now // 60)
+    return [
+        COMPLETIONS_KEY.format(minute - offset)
+        for offset in range(settings.ADMISSION_RATE_WINDOW_MINUTES)
+    ]
+
+
+def record_completion(amount: float = 1.0):
+    """
+    Count a finished summary task towards the worker completion rate.
+
+    Rates are in broker messages, to match the queue length: a course from a
+    batch chunk counts as its share of the chunk's message.
+    """
+    key = completion_keys(time.time())[0]
+    try:
+        with redis_sync_client.pipeline() as pipe:
+            pipe.incrbyfloat(key, amount)
+            pipe.expire(key, (settings.ADMISSION_RATE_WINDOW_MINUTES + 1) * 60)
+            pipe.execute()
+    except Exception as e:
+        logger.warning(f"[Admission] Could not record completion: {e}")
+
+
+def measure_throughput(counts: list, now: float, last_known: float | None) -> float:
+    """
+    Tasks completed per second, from per-minute counts ordered newest first.
+
+    The rate is taken over the time since the oldest minute with completions,
+    so a burst after an idle period is not averaged against the idle minutes.
+    Until that covers the whole window, the estimate does not drop below the
+    last known throughput, which also stands in when nothing completed lately.
+    """
+    active = [offset for offset, count in enumerate(counts) if count]
+    if not active:
+        return max(last_known or 0.0, settings.ADMISSION_MIN_THROUGHPUT)
+
+    completed = sum(float(count) for count in counts if count)
+    elapsed = max(active) * 60 + now % 60
+    throughput = completed / max(elapsed, 1.0)
+    if max(active) < len(counts) - 1:
+        throughput = max(throughput, last_known or 0.0)
+    return max(throughput, settings.ADMISSION_MIN_THROUGHPUT)
+
+
+async def estimate_wait() -> float:
+    """
+    Estimate seconds until newly queued work starts, from the broker queue
+    length and the recent worker completion rate.
+    """
+    now = time.time()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.llen(settings.CELERY_QUEUE_NAME)
+        pipe.mget(completion_keys(now))
+        pipe.get(THROUGHPUT_KEY)
+        depth, counts, last_known = await pipe.execute()
+
+    throughput = measure_throughput(
+        counts, now, float(last_known) if last_known else None
+    )
+    if counts[-1]:
+        # Completions span the whole window: remember this rate for idle periods.
+        await redis_client.set(THROUGHPUT_KEY, throughput)
+    return depth / throughput
+
+
+async def check_admission(priority: str = "interactive") -> float:
+    """
+    Admit new summary work only while the estimated queue wait is below the
+    threshold for its priority. Bulk work has the lower threshold and is shed
+    first. Redis errors admit the request.
+
+    Raises:
+        HTTPException: 503 with Retry-After when the queue is overloaded.
+
+    Returns:
+        float: The estimated wait in seconds.
+    """
+    try:
+        wait = await estimate_wait()
+    except Exception as e:
+        logger.warning(f"[Admission] Could not estimate queue wait: {e}")
+        return 0.0
+
+    max_wait = (
+        settings.ADMISSION_BULK_MAX_WAIT_SECONDS
+        if priority == "bulk"
+        else settings.ADMISSION_MAX_WAIT_SECONDS
+    )
+    if wait > max_wait:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Summary queue is overloaded. Try again later.",
+            headers={"Retry-After": str(max(1, math.ceil(wait - max_wait)))},
+        )
+    return wait
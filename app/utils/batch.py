@@ -0,0 +1,31 @@
+import json
+import uuid
+from typing import Optional
+
+from app.db.redis import redis_client
+from app.settings import settings
+
+
+def batch_key(batch_id) -> str:
+    return f"summary_batch:{batch_id}"
+
+
+async def create_batch(user_id, course_ids: list) -> str:
+    """Remember which courses belong to a batch so progress can be reported."""
+    batch_id = str(uuid.uuid4())
+    await redis_client.set(
+        batch_key(batch_id),
+        json.dumps(
+            {
+                "user_id": str(user_id),
+                "course_ids": [str(course_id) for course_id in course_ids],
+            }
+        ),
+        ex=settings.BATCH_TTL_SECONDS,
+    )
+    return batch_id
+
+
+async def get_batch(batch_id) -> Optional[dict]:
+    raw = await redis_client.get(batch_key(batch_id))
+    return json.loads(raw) if raw else None
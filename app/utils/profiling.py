@@ -0,0 +1,253 @@
+import functools
+import json
+import logging
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from fastapi import HTTPException, Request, status
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+
+from app.db.redis import redis_client, redis_sync_client
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+# Most recent profile ids kept per request path or task name.
+PROFILE_INDEX_SIZE = 100
+
+
+def profile_key(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+def profile_index_key(name: str) -> str:
+    return f"profiles:{name}"
+
+
+def is_authorized(token: str | None) -> bool:
+    """Check a profiling token against the configured one."""
+    return bool(settings.PROFILING_TOKEN) and secrets.compare_digest(
+        token or "", settings.PROFILING_TOKEN
+    )
+
+
+def should_sample() -> bool:
+    """Sample 1 in PROFILING_SAMPLE_RATE executions; 0 disables sampling."""
+    rate = settings.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.randrange(rate) == 0
+
+
+class CPUStackSampler:
+    """
+    Sample one thread's Python stack, weighting each sample by the CPU time
+    the thread consumed since the previous sample.
+
+    pyinstrument only records wall-clock stacks, so time spent waiting on
+    Redis, Postgres or OpenAI dominates its view. This sampler complements it
+    with a CPU-time view: stacks that sit idle in I/O get no weight. For
+    requests the sampled thread is the event loop, so CPU used by concurrent
+    requests on the same loop is attributed as well.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if not hasattr(time, "pthread_getcpuclockid"):
+            # Per-thread CPU clocks are POSIX only; skip the CPU view elsewhere.
+            return
+        self._clock = time.pthread_getcpuclockid(self.thread_id)
+        self._last = time.clock_gettime(self._clock)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.clock_gettime(self._clock)
+            used, self._last = now - self._last, now
+            if frame is None or used <= 0:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += used
+
+    def speedscope_profile(self, frames: list[dict], name: str) -> dict:
+        """
+        Build a speedscope "sampled" profile, appending new frames to the
+        document's shared frame list.
+        """
+        index = {
+            (f["name"], f.get("file"), f.get("line")): i for i, f in enumerate(frames)
+        }
+        samples, weights = [], []
+        for stack, used in self.samples.items():
+            sample = []
+            for name_, file, line in stack:
+                key = (name_, file, line)
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({"name": name_, "file": file, "line": line})
+                sample.append(index[key])
+            samples.append(sample)
+            weights.append(used)
+        return {
+            "type": "sampled",
+            "name": name,
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }
+
+
+def start_profilers(async_mode: str) -> tuple[Profiler, CPUStackSampler]:
+    """Start a wall-clock profiler and a CPU sampler on the current thread."""
+    profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode=async_mode)
+    sampler = CPUStackSampler(threading.get_ident(), settings.PROFILING_INTERVAL)
+    profiler.start()
+    sampler.start()
+    return profiler, sampler
+
+
+def stop_profilers(profiler: Profiler, sampler: CPUStackSampler):
+    sampler.stop()
+    profiler.stop()
+
+
+def render_report(
+    profiler: Profiler, sampler: CPUStackSampler, name: str, wall: float, cpu: float
+) -> str:
+    """
+    Render a finished profile as a speedscope document holding the wall-clock
+    profile and, when available, the CPU-time profile, with wall-clock and CPU
+    totals in its name.
+    """
+    report = json.loads(profiler.output(SpeedscopeRenderer()))
+    report["name"] = f"{name} (wall {wall:.3f}s, cpu {cpu:.3f}s)"
+    report["profiles"][0]["name"] = f"{name} (wall)"
+    if sampler.samples:
+        report["profiles"].append(
+            sampler.speedscope_profile(report["shared"]["frames"], f"{name} (cpu)")
+        )
+    return json.dumps(report)
+
+
+async def profile_request(request: Request, call_next):
+    """
+    HTTP middleware profiling requests that carry a valid profiling token or
+    fall into the sample. Only installed when PROFILING_ENABLED is set.
+    """
+    if not (is_authorized(request.headers.get(PROFILE_HEADER)) or should_sample()):
+        return await call_next(request)
+
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    profiler, sampler = start_profilers("enabled")
+    try:
+        response = await call_next(request)
+    finally:
+        stop_profilers(profiler, sampler)
+
+    profile_id = str(uuid.uuid4())
+    report = render_report(
+        profiler,
+        sampler,
+        f"{request.method} {request.url.path}",
+        time.perf_counter() - wall_started,
+        time.process_time() - cpu_started,
+    )
+    try:
+        index_key = profile_index_key(request.url.path)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(profile_key(profile_id), report, ex=settings.PROFILING_TTL_SECONDS)
+            pipe.lpush(index_key, profile_id)
+            pipe.ltrim(index_key, 0, PROFILE_INDEX_SIZE - 1)
+            pipe.expire(index_key, settings.PROFILING_TTL_SECONDS)
+            await pipe.execute()
+        response.headers[PROFILE_ID_HEADER] = profile_id
+    except Exception as e:
+        logger.warning(f"[Profiling] Could not store request profile: {e}")
+    return response
+
+
+def profiled_task(func):
+    """
+    Profile a sampled share of Celery task executions.
+
+    Returns the function unchanged when profiling is disabled.
+    """
+    if not settings.PROFILING_ENABLED:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not should_sample():
+            return func(*args, **kwargs)
+
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        profiler, sampler = start_profilers("disabled")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stop_profilers(profiler, sampler)
+            profile_id = str(uuid.uuid4())
+            report = render_report(
+                profiler,
+                sampler,
+                f"task {func.__name__}",
+                time.perf_counter() - wall_started,
+                time.process_time() - cpu_started,
+            )
+            try:
+                index_key = profile_index_key(f"task:{func.__name__}")
+                with redis_sync_client.pipeline(transaction=False) as pipe:
+                    pipe.set(
+                        profile_key(profile_id),
+                        report,
+                        ex=settings.PROFILING_TTL_SECONDS,
+                    )
+                    pipe.lpush(index_key, profile_id)
+                    pipe.ltrim(index_key, 0, PROFILE_INDEX_SIZE - 1)
+                    pipe.expire(index_key, settings.PROFILING_TTL_SECONDS)
+                    pipe.execute()
+                logger.info(f"[Profiling] Stored {func.__name__} profile {profile_id}")
+            except Exception as e:
+                logger.warning(f"[Profiling] Could not store task profile: {e}")
+
+    return wrapper
+
+
+def require_profiling_token(request: Request):
+    """
+    Dependency guarding profile retrieval behind the profiling token.
+
+    Raises:
+        HTTPException: 403 if the token is missing or wrong.
+    """
+    if not is_authorized(request.headers.get(PROFILE_HEADER)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token"
+        )
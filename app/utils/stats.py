@@ -0,0 +1,148 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+
+from app.db.redis import redis_client, redis_sync_client
+from app.models.course import Course
+from app.summarizers import (
+    STATUS_COMPLETED,
+    STATUS_LOCAL,
+    STATUS_LOCAL_PREVIEW,
+    STATUS_PENDING,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = (STATUS_PENDING, STATUS_LOCAL_PREVIEW)
+COMPLETED_STATUSES = (STATUS_COMPLETED, STATUS_LOCAL)
+
+# Apply HINCRBY pairs only to an already seeded hash, so a partial hash is never
+# mistaken for complete counters.
+INCREMENT_IF_SEEDED = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call("HINCRBY", KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+increment_async = redis_client.register_script(INCREMENT_IF_SEEDED)
+increment_sync = redis_sync_client.register_script(INCREMENT_IF_SEEDED)
+
+
+def stats_key(user_id) -> str:
+    return f"user_stats:{user_id}"
+
+
+def status_field(status: str) -> str:
+    return f"status:{status}"
+
+
+def status_change(previous: str, new: str) -> dict:
+    if previous == new:
+        return {}
+    return {status_field(previous): -1, status_field(new): 1}
+
+
+def flatten(delta: dict) -> list:
+    return [item for field, amount in delta.items() for item in (field, amount)]
+
+
+async def record_stats(user_id, delta: dict):
+    """Apply counter deltas for a user from the API; Redis errors are logged."""
+    if not delta:
+        return
+    try:
+        await increment_async(keys=[stats_key(user_id)], args=flatten(delta))
+    except Exception as e:
+        logger.warning(f"[Stats] Could not update stats for {user_id}: {e}")
+
+
+def record_stats_sync(user_id, delta: dict):
+    """Apply counter deltas for a user from a Celery worker."""
+    if not delta:
+        return
+    try:
+        increment_sync(keys=[stats_key(user_id)], args=flatten(delta))
+    except Exception as e:
+        logger.warning(f"[Stats] Could not update stats for {user_id}: {e}")
+
+
+def update_course_returning_previous(*criteria, **values):
+    """
+    Build an UPDATE on courses that returns the user and the status the row
+    had before the update, via a locked self-join.
+    """
+    previous = (
+        select(Course.id, Course.user_id, Course.status)
+        .where(*criteria)
+        .with_for_update()
+        .subquery()
+    )
+    return (
+        update(Course)
+        .where(Course.id == previous.c.id)
+        .values(**values)
+        .returning(previous.c.user_id, previous.c.status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def count_statement(user_id=None):
+    statement = select(Course.user_id, Course.status, func.count()).group_by(
+        Course.user_id, Course.status
+    )
+    if user_id is not None:
+        statement = statement.where(Course.user_id == user_id)
+    return statement
+
+
+def build_counters(rows) -> dict[UUID, dict]:
+    counters: dict[UUID, dict] = {}
+    for user_id, status, count in rows:
+        user_counters = counters.setdefault(user_id, {"courses": 0})
+        user_counters["courses"] += count
+        user_counters[status_field(status)] = count
+    return counters
+
+
+async def get_user_counters(db, user_id) -> dict[str, int]:
+    """
+    Read a user's counters from Redis, seeding them from Postgres on first use.
+    """
+    try:
+        counters = await redis_client.hgetall(stats_key(user_id))
+    except Exception as e:
+        logger.warning(f"[Stats] Could not read stats for {user_id}: {e}")
+        counters = None
+    if counters:
+        return {field: int(value) for field, value in counters.items()}
+
+    rows = (await db.execute(count_statement(user_id))).all()
+    counters = build_counters(rows).get(user_id, {"courses": 0})
+    try:
+        await redis_client.hset(stats_key(user_id), mapping=counters)
+    except Exception as e:
+        logger.warning(f"[Stats] Could not seed stats for {user_id}: {e}")
+    return counters
+
+
+def reconcile_all(session):
+    """
+    Recompute every user's counters from Postgres and overwrite the Redis
+    hashes, correcting drift from missed or failed increments.
+    """
+    counters = build_counters(session.execute(count_statement()).all())
+    expected = {stats_key(user_id): values for user_id, values in counters.items()}
+    for key in redis_sync_client.scan_iter(match=stats_key("*")):
+        expected.setdefault(key, {"courses": 0})
+
+    with redis_sync_client.pipeline() as pipe:
+        for key, values in expected.items():
+            pipe.delete(key)
+            pipe.hset(key, mapping=values)
+        pipe.execute()
+    return len(counters)
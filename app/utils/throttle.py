@@ -1,24 +1,52 @@
 from fastapi import HTTPException, status
 from limits import RateLimitItemPerDay
-from limits.storage import MemoryStorage
+from limits.aio.storage import RedisStorage
 
-rate_limit = RateLimitItemPerDay(3)
-storage = MemoryStorage()
+from app.db.redis import REDIS_URL
+from app.settings import settings
 
+rate_limit = RateLimitItemPerDay(settings.SUMMARY_DAILY_LIMIT)
+# Shared by every API process, so the quota and the usage reported from it
+# hold across workers and restarts.
+storage = RedisStorage(f"async+{REDIS_URL}", implementation="redispy")
 
-def check_throttle(user_id: str):
+
+def throttle_key(user_id: str) -> str:
+    return f"generate_summary:{user_id}"
+
+
+async def get_throttle_usage(user_id: str) -> int:
+    """Return how many summaries count against the user's limit right now."""
+    _, count = await storage.get_moving_window(
+        throttle_key(user_id), rate_limit.amount, rate_limit.get_expiry()
+    )
+    return count
+
+
+async def get_remaining_quota(user_id: str) -> int:
+    """Return how many more summaries the user may generate right now."""
+    return max(rate_limit.amount - await get_throttle_usage(user_id), 0)
+
+
+async def check_throttle(user_id: str, amount: int = 1):
     """
-    Limits summary generation to 3 times per user per day.
+    Limits summary generation to SUMMARY_DAILY_LIMIT times per user in a
+    rolling 24-hour window.
+
+    `amount` charges several summaries at once, e.g. for a batch request.
 
     Raises:
         HTTPException: If the user exceeds the daily limit.
     """
-    key = f"generate_summary:{user_id}"
+    key = throttle_key(user_id)
 
-    if not storage.acquire_entry(
-        key, rate_limit.amount, expiry=rate_limit.get_expiry()
+    if not await storage.acquire_entry(
+        key, rate_limit.amount, expiry=rate_limit.get_expiry(), amount=amount
     ):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="You have exceeded the daily limit of 3 summaries. Try again tomorrow.",
+            detail=(
+                f"You have exceeded the daily limit of {rate_limit.amount} "
+                "summaries. Try again tomorrow."
+            ),
         )
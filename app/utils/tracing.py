@@ -0,0 +1,328 @@
+import atexit
+import importlib
+import json
+import logging
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+
+class Span:
+    """
+    A single timed operation, exported in the OTLP JSON span layout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: str = "",
+        start_ns: Optional[int] = None,
+        attributes: Optional[dict] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = 0
+        self.attributes = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = repr(error)
+        exporter = get_exporter()
+        if exporter is not None:
+            try:
+                exporter.export([self])
+            except Exception as e:
+                logger.warning(f"[Tracing] Span export failed: {e}")
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_document(spans: list[Span]) -> dict:
+    """Wrap spans in an OTLP/JSON ExportTraceServiceRequest document."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {
+                            "key": "service.name",
+                            "value": otlp_value(settings.TRACING_SERVICE_NAME),
+                        }
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app"},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter(ABC):
+    """
+    Base class for span exporters. Subclasses receive finished spans.
+    """
+
+    @abstractmethod
+    def export(self, spans: list[Span]):
+        """Write a batch of finished spans."""
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Write one OTLP/JSON document per line to stdout."""
+
+    def export(self, spans: list[Span]):
+        sys.stdout.write(json.dumps(otlp_document(spans)) + "\n")
+        sys.stdout.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Append one OTLP/JSON document per line to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]):
+        line = json.dumps(otlp_document(spans)) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+
+class BufferedSpanExporter(SpanExporter):
+    """
+    Queue finished spans and hand them to another exporter in batches from a
+    background thread, so request handlers and tasks never wait on its I/O.
+    """
+
+    def __init__(self, exporter: SpanExporter, interval: float, max_batch: int = 512):
+        self.exporter = exporter
+        self.interval = interval
+        self.max_batch = max_batch
+        self._start()
+        # Celery forks its workers after import; the thread does not survive.
+        os.register_at_fork(after_in_child=self._start)
+        atexit.register(self.flush)
+
+    def _start(self):
+        # A forked child gets a fresh lock: the parent's flush thread may have
+        # held the inherited one at fork time, and it would never be released.
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        threading.Thread(target=self._run, name="span-exporter", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def export(self, spans: list[Span]):
+        for span in spans:
+            self._queue.put(span)
+
+    def flush(self):
+        """Export every queued span."""
+        with self._lock:
+            spans = []
+            while True:
+                try:
+                    spans.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for start in range(0, len(spans), self.max_batch):
+                batch = spans[start : start + self.max_batch]  # noqa: E203
+                try:
+                    self.exporter.export(batch)
+                except Exception as e:
+                    logger.warning(f"[Tracing] Span export failed: {e}")
+
+
+_exporter: Optional[SpanExporter] = None
+_exporter_loaded = False
+
+
+def load_exporter(name: str) -> Optional[SpanExporter]:
+    """
+    Build an exporter from TRACING_EXPORTER: "console", "file", or the
+    "package.module:ClassName" path of a SpanExporter subclass. Spans are
+    buffered and exported every TRACING_FLUSH_SECONDS.
+    """
+    if not name:
+        return None
+    if name == "console":
+        exporter = ConsoleSpanExporter()
+    elif name == "file":
+        exporter = FileSpanExporter(settings.TRACING_FILE_PATH)
+    else:
+        module_name, _, class_name = name.partition(":")
+        exporter = getattr(importlib.import_module(module_name), class_name)()
+    return BufferedSpanExporter(exporter, settings.TRACING_FLUSH_SECONDS)
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    global _exporter, _exporter_loaded
+    if not _exporter_loaded:
+        _exporter = load_exporter(settings.TRACING_EXPORTER)
+        _exporter_loaded = True
+    return _exporter
+
+
+def set_exporter(exporter: Optional[SpanExporter]):
+    """Replace the active exporter, e.g. with an in-memory one in tests."""
+    global _exporter, _exporter_loaded
+    _exporter = exporter
+    _exporter_loaded = True
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def begin_span(
+    name: str,
+    attributes: Optional[dict] = None,
+    traceparent: Optional[str] = None,
+    start_ns: Optional[int] = None,
+) -> Optional[Span]:
+    """
+    Create a child of the current span, or of the remote parent given by
+    traceparent, or a new root span. Returns None when tracing is disabled.
+    """
+    if get_exporter() is None:
+        return None
+
+    parent = current_span.get()
+    remote = extract(traceparent) if traceparent else None
+    if remote:
+        trace_id, parent_span_id = remote
+    elif parent:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_span_id = secrets.token_hex(16), ""
+    return Span(name, trace_id, parent_span_id, start_ns, attributes)
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[dict] = None,
+    traceparent: Optional[str] = None,
+    start_ns: Optional[int] = None,
+):
+    """Run the enclosed block as the current span."""
+    span = begin_span(name, attributes, traceparent, start_ns)
+    if span is None:
+        yield None
+        return
+
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.end(error=e)
+        raise
+    else:
+        span.end()
+    finally:
+        current_span.reset(token)
+
+
+def inject() -> dict:
+    """Return W3C trace context headers for the current span, if any."""
+    span = current_span.get()
+    if span is None:
+        return {}
+    return {TRACEPARENT_HEADER: f"00-{span.trace_id}-{span.span_id}-01"}
+
+
+def extract(traceparent: str) -> Optional[tuple[str, str]]:
+    """Parse a W3C traceparent header into (trace_id, parent_span_id)."""
+    parts = traceparent.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def instrument_engine(engine):
+    """
+    Record a span for every SQL statement executed inside an active trace.
+    Does nothing when tracing is disabled.
+    """
+    if get_exporter() is None:
+        return
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if current_span.get() is None:
+            return
+        context._trace_span = begin_span(
+            "db.query",
+            {"db.system": conn.dialect.name, "db.statement": statement},
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.end()
+            context._trace_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.end(error=exception_context.original_exception)
+            context._trace_span = None
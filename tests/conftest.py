@@ -0,0 +1,134 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# The app builds its engines at import time, so point them at a throwaway
+# SQLite database before anything from `app` is imported.
+DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["DATABASE_SYNC_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["TRACING_EXPORTER"] = ""
+os.environ["PROFILING_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from limits.aio.storage import MemoryStorage  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.db.session_sync import SessionLocal  # noqa: E402
+from app.db.session_sync import engine as sync_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routes import courses  # noqa: E402
+from app.utils import batch, throttle  # noqa: E402
+from app.utils.token import get_current_user  # noqa: E402
+from app.utils.tracing import SpanExporter, set_exporter  # noqa: E402
+
+
+class QueryCounter:
+    """Collect the SQL statements the API engine executes."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, many):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+class FakeAsyncRedis:
+    """The part of the async Redis client used by the routes, kept in a dict."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, xx=False, get=False):
+        previous = self.values.get(key)
+        if (nx and previous is not None) or (xx and previous is None):
+            return previous if get else None
+        self.values[key] = str(value)
+        return previous if get else True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+class MemorySpanExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(sync_engine)
+    yield
+    Base.metadata.drop_all(sync_engine)
+
+
+@pytest.fixture(autouse=True)
+def throttle_storage(monkeypatch):
+    """Keep the quota in memory; the tests run without Redis."""
+    storage = MemoryStorage()
+    monkeypatch.setattr(throttle, "storage", storage)
+    return storage
+
+
+@pytest.fixture
+def user(database):
+    with SessionLocal() as session:
+        user = User(
+            id=uuid.uuid4(),
+            name="Test User",
+            email=f"{uuid.uuid4().hex}@example.com",
+            hashed_password="hashed",
+        )
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        session.expunge(user)
+    return user
+
+
+@pytest.fixture
+def client(user):
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def queries():
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def async_redis(monkeypatch):
+    fake = FakeAsyncRedis()
+    monkeypatch.setattr(courses, "redis_client", fake)
+    monkeypatch.setattr(batch, "redis_client", fake)
+    return fake
+
+
+@pytest.fixture
+def spans():
+    exporter = MemorySpanExporter()
+    set_exporter(exporter)
+    yield exporter.spans
+    set_exporter(None)
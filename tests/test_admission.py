@@ -0,0 +1,26 @@
+from app.settings import settings
+from app.utils.admission import measure_throughput
+
+WINDOW = settings.ADMISSION_RATE_WINDOW_MINUTES
+
+
+def test_idle_window_keeps_last_known_throughput():
+    counts = [None] * WINDOW
+
+    assert measure_throughput(counts, 0.0, 2.0) == 2.0
+    assert measure_throughput(counts, 0.0, None) == settings.ADMISSION_MIN_THROUGHPUT
+
+
+def test_burst_after_idle_is_measured_over_active_time():
+    # 30 completions in the first 10 seconds of the current minute.
+    counts = ["30"] + [None] * (WINDOW - 1)
+
+    assert measure_throughput(counts, 70.0, None) == 3.0
+    assert measure_throughput(counts, 70.0, 5.0) == 5.0
+
+
+def test_full_window_replaces_last_known_throughput():
+    elapsed = (WINDOW - 1) * 60 + 30
+    counts = [str(elapsed // WINDOW)] * WINDOW
+
+    assert measure_throughput(counts, 30.0, 5.0) == 1.0
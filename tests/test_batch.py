@@ -0,0 +1,151 @@
+import asyncio
+import uuid
+
+import pytest
+from celery.canvas import group
+from sqlalchemy import select, update
+
+from app.db.session_sync import SessionLocal
+from app.models.course import Course
+from app.routes import courses
+from app.settings import settings
+from app.summarizers import STATUS_COMPLETED
+from app.utils.throttle import get_remaining_quota
+from app.utils.tracing import extract
+
+
+@pytest.fixture
+def published(monkeypatch, async_redis):
+    """Chunk messages the batch endpoint publishes, one list of items per chunk."""
+    chunks = []
+
+    async def check_admission(priority="interactive"):
+        return 0.0
+
+    async def record_stats(user_id, delta):
+        pass
+
+    def apply_async(self, headers=None):
+        chunks.extend(signature.kwargs["it"] for signature in self.tasks)
+
+    monkeypatch.setattr(courses, "check_admission", check_admission)
+    monkeypatch.setattr(courses, "record_stats", record_stats)
+    monkeypatch.setattr(group, "apply_async", apply_async)
+    monkeypatch.setattr(settings, "BATCH_CHUNK_SIZE", 2)
+    return chunks
+
+
+def create_courses(client, count: int) -> list[str]:
+    return [
+        client.post(
+            "/courses",
+            json={"course_title": f"Course {i}", "course_description": f"About {i}."},
+        ).json()["id"]
+        for i in range(count)
+    ]
+
+
+def course_statuses(course_ids) -> dict[str, str]:
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(Course.id, Course.status).where(
+                Course.id.in_([uuid.UUID(course_id) for course_id in course_ids])
+            )
+        )
+        return {str(course_id): status for course_id, status in rows}
+
+
+def test_batch_publishes_weighted_chunks_in_the_request_trace(client, published, spans):
+    course_ids = create_courses(client, 3)
+    with SessionLocal() as session:
+        session.execute(
+            update(Course)
+            .where(Course.id.in_([uuid.UUID(course_id) for course_id in course_ids]))
+            .values(status=STATUS_COMPLETED)
+        )
+        session.commit()
+
+    response = client.post("/generate_summary/batch", json={"course_ids": course_ids})
+
+    assert response.status_code == 202
+    assert response.json()["total"] == 3
+    assert set(course_statuses(course_ids).values()) == {"pending"}
+
+    assert [[item[0] for item in chunk] for chunk in published] == [
+        course_ids[:2],
+        course_ids[2:],
+    ]
+    assert [item[4] for chunk in published for item in chunk] == [0.5, 0.5, 1.0]
+    assert {item[1] for chunk in published for item in chunk} == {
+        "About 0.",
+        "About 1.",
+        "About 2.",
+    }
+
+    (request_span,) = [s for s in spans if s.name == "POST /generate_summary/batch"]
+    for chunk in published:
+        for item in chunk:
+            trace_id, _ = extract(item[3])
+            assert trace_id == request_span.trace_id
+
+
+def test_batch_with_a_foreign_course_is_rejected_and_rolled_back(
+    client, user, published
+):
+    (course_id,) = create_courses(client, 1)
+    with SessionLocal() as session:
+        session.execute(
+            update(Course)
+            .where(Course.id == uuid.UUID(course_id))
+            .values(status=STATUS_COMPLETED)
+        )
+        session.commit()
+
+    response = client.post(
+        "/generate_summary/batch",
+        json={"course_ids": [course_id, str(uuid.uuid4())]},
+    )
+
+    assert response.status_code == 404
+    assert course_statuses([course_id]) == {course_id: STATUS_COMPLETED}
+    assert published == []
+    assert (
+        asyncio.run(get_remaining_quota(str(user.id))) == settings.SUMMARY_DAILY_LIMIT
+    )
+
+
+def test_batch_progress_reports_current_statuses(client, published):
+    course_ids = create_courses(client, 3)
+    batch_id = client.post(
+        "/generate_summary/batch", json={"course_ids": course_ids}
+    ).json()["batch_id"]
+
+    with SessionLocal() as session:
+        session.execute(
+            update(Course)
+            .where(Course.id == uuid.UUID(course_ids[0]))
+            .values(status=STATUS_COMPLETED)
+        )
+        session.commit()
+    client.delete(f"/courses/{course_ids[1]}")
+
+    progress = client.get(f"/generate_summary/batch/{batch_id}").json()
+
+    assert progress["total"] == 3
+    assert progress["completed"] == 1
+    assert progress["status_counts"] == {
+        STATUS_COMPLETED: 1,
+        "deleted": 1,
+        "pending": 1,
+    }
+    assert progress["course_statuses"] == {
+        course_ids[0]: STATUS_COMPLETED,
+        course_ids[1]: "deleted",
+        course_ids[2]: "pending",
+    }
+
+
+def test_unknown_batch_is_not_found(client, published):
+    response = client.get(f"/generate_summary/batch/{uuid.uuid4()}")
+
+    assert response.status_code == 404
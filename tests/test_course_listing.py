@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from app.routes.courses import UTCORJSONResponse
+
+
+def test_listing_matches_single_course_output(client):
+    created = client.post(
+        "/courses",
+        json={"course_title": "Python", "course_description": "Learn Python."},
+    ).json()
+
+    listing = client.get("/courses").json()
+    single = client.get(f"/courses/{created['id']}").json()
+
+    assert single in listing
+
+
+def test_utc_datetimes_use_z_suffix():
+    created_at = datetime(2025, 4, 12, 16, 44, 10, 870000, tzinfo=timezone.utc)
+
+    body = UTCORJSONResponse([{"created_at": created_at}]).body
+
+    assert body == b'[{"created_at":"2025-04-12T16:44:10.870000Z"}]'
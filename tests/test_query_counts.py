@@ -0,0 +1,90 @@
+"""
+Each mutating endpoint must stay a single SQL statement; these tests fail if
+an extra SELECT, refresh or existence check creeps back in.
+"""
+
+import uuid
+
+import pytest
+
+from app.routes import courses, users
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch):
+    async def record_stats(user_id, delta):
+        pass
+
+    monkeypatch.setattr(courses, "record_stats", record_stats)
+    monkeypatch.setattr(users, "hash_password", lambda password: f"hashed:{password}")
+
+
+def create_course(client) -> str:
+    response = client.post(
+        "/courses",
+        json={"course_title": "Python", "course_description": "Learn Python."},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_create_course_is_one_statement(client, queries):
+    create_course(client)
+
+    assert queries.count == 1
+    assert queries.statements[0].startswith("INSERT INTO courses")
+
+
+def test_update_summary_is_one_statement(client, queries):
+    course_id = create_course(client)
+    queries.statements.clear()
+
+    response = client.patch(
+        "/courses/update-summary",
+        json={"course_id": course_id, "new_summary": "A manual summary."},
+    )
+
+    assert response.status_code == 200
+    assert queries.count == 1
+    assert queries.statements[0].startswith("UPDATE courses")
+
+
+def test_update_summary_of_missing_course_is_one_statement(client, queries):
+    response = client.patch(
+        "/courses/update-summary",
+        json={"course_id": str(uuid.uuid4()), "new_summary": "A manual summary."},
+    )
+
+    assert response.status_code == 404
+    assert queries.count == 1
+
+
+def test_delete_course_is_one_statement(client, queries):
+    course_id = create_course(client)
+    queries.statements.clear()
+
+    response = client.delete(f"/courses/{course_id}")
+
+    assert response.status_code == 204
+    assert queries.count == 1
+    assert queries.statements[0].startswith("DELETE FROM courses")
+
+
+def test_register_user_is_one_statement(client, queries):
+    payload = {
+        "name": "New User",
+        "email": f"{uuid.uuid4().hex}@example.com",
+        "password": "password123",
+    }
+
+    response = client.post("/users", json=payload)
+
+    assert response.status_code == 201
+    assert queries.count == 1
+    assert queries.statements[0].startswith("INSERT INTO users")
+
+    queries.statements.clear()
+    duplicate = client.post("/users", json=payload)
+
+    assert duplicate.status_code == 400
+    assert queries.count == 1
@@ -0,0 +1,118 @@
+import httpx
+import pytest
+
+from app import openai_service
+from app.openai_service import (
+    ModelHealth,
+    call_with_fallback,
+    get_model_health,
+    route_models,
+    select_primary_model,
+)
+from app.settings import settings
+
+SMALL = settings.OPENAI_SMALL_MODEL
+LARGE = settings.OPENAI_MODEL
+
+
+@pytest.fixture(autouse=True)
+def fresh_health(monkeypatch):
+    monkeypatch.setattr(openai_service, "model_health", {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(openai_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def degrade(model: str):
+    for _ in range(5):
+        get_model_health(model).record(0.1, failed=True)
+
+
+def test_primary_model_follows_input_length_and_plan(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTING_PREMIUM_PLANS", ["pro"])
+    medium = "x" * settings.ROUTING_SHORT_INPUT_CHARS
+
+    assert select_primary_model("short") == SMALL
+    assert select_primary_model("x" * settings.ROUTING_LONG_INPUT_CHARS) == LARGE
+    assert select_primary_model(medium, "free") == SMALL
+    assert select_primary_model(medium, "pro") == LARGE
+
+
+def test_degraded_primary_moves_behind_healthy_models(clock):
+    degrade(SMALL)
+
+    models = route_models("short")
+
+    assert models[0] != SMALL
+    assert models[-1] == SMALL
+
+
+def test_degraded_model_is_probed_once_after_recovery_period(clock):
+    health = ModelHealth()
+    for _ in range(5):
+        health.record(0.1, failed=True)
+
+    assert not health.is_healthy()
+
+    clock[0] += settings.ROUTING_RECOVERY_SECONDS
+    assert health.is_healthy()
+    assert not health.is_healthy()
+
+
+def test_successful_probe_restores_the_model(clock):
+    health = ModelHealth()
+    for _ in range(5):
+        health.record(0.1, failed=True)
+
+    health.record(0.2, failed=False)
+
+    assert health.is_healthy()
+    assert health.error_rate == 0.0
+
+
+def test_fallback_tries_each_model_once_and_retries_only_the_last(clock):
+    calls = []
+
+    def call(model, retries):
+        calls.append((model, retries))
+        if len(calls) < len(route_models("short")):
+            raise httpx.ReadTimeout("timeout")
+        return "summary"
+
+    result, model = call_with_fallback("short", "free", call)
+
+    models = route_models("short")
+    assert result == "summary"
+    assert model == models[-1]
+    assert calls == [(m, 1) for m in models[:-1]] + [(models[-1], 3)]
+
+
+def test_fallback_raises_when_every_model_fails(clock):
+    def call(model, retries):
+        raise ValueError("bad response")
+
+    with pytest.raises(ValueError):
+        call_with_fallback("short", "free", call)
+
+
+@pytest.mark.parametrize(
+    ("status_code", "counted"), [(400, False), (404, False), (429, True), (503, True)]
+)
+def test_only_upstream_errors_degrade_the_model(monkeypatch, status_code, counted):
+    client = httpx.Client
+
+    def mock_client(timeout):
+        return client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(status_code))
+        )
+
+    monkeypatch.setattr(openai_service.httpx, "Client", mock_client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        openai_service.request_completion({"model": SMALL, "messages": []})
+
+    assert (get_model_health(SMALL).error_rate > 0) is counted
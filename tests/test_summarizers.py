@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+
+from app.routes import courses
+from app.summarizers import STATUS_LOCAL, LocalExtractiveSummarizer, SummarizerBackend
+
+
+def test_backend_must_implement_summarize():
+    with pytest.raises(TypeError):
+        SummarizerBackend()
+
+
+def test_repeated_sentences_are_kept_once():
+    description = (
+        "Learn Python from scratch. Learn Python from scratch. "
+        "Build web APIs with FastAPI. Learn Python from scratch. "
+        "Deploy your apps with Docker."
+    )
+
+    summary, _ = LocalExtractiveSummarizer(max_sentences=2).summarize(description)
+
+    assert summary.count("Learn Python from scratch.") <= 1
+    assert len(summary.split(". ")) == 2
+
+
+@pytest.mark.parametrize("description", ["", "   "])
+def test_blank_description_is_rejected(client, description):
+    response = client.post(
+        "/generate_summary",
+        json={"course_id": str(uuid.uuid4()), "new_description": description},
+    )
+
+    assert response.status_code == 422
+
+
+def test_short_description_is_not_charged(monkeypatch, client):
+    async def record_stats(user_id, delta):
+        pass
+
+    async def check_throttle(user_id, amount=1):
+        raise AssertionError("local-only summaries must not use the quota")
+
+    monkeypatch.setattr(courses, "record_stats", record_stats)
+    monkeypatch.setattr(courses, "check_throttle", check_throttle)
+    course_id = client.post(
+        "/courses",
+        json={"course_title": "Python", "course_description": "Learn Python."},
+    ).json()["id"]
+
+    response = client.post(
+        "/generate_summary",
+        json={"course_id": course_id, "new_description": "Learn Python fast."},
+    )
+
+    assert response.status_code == 202
+    assert response.json()["status"] == STATUS_LOCAL
@@ -0,0 +1,195 @@
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.session_sync import SessionLocal
+from app.models.course import Course
+from app.routes import courses
+from app.summarizers import (
+    VARIANTS_ATTEMPTS_PER_CHARGE,
+    VARIANTS_FAILED,
+    VARIANTS_PENDING,
+    description_hash,
+    parse_variants_failure,
+    variants_lock_key,
+)
+from app.tasks import summary
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(summary, "redis_sync_client", fake)
+    return fake
+
+
+@pytest.fixture
+def course_id(user):
+    with SessionLocal() as session:
+        course = Course(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            course_title="Python",
+            course_description="Learn Python.",
+        )
+        session.add(course)
+        session.commit()
+        return course.id
+
+
+def test_failed_generation_leaves_a_retry_marker(monkeypatch, redis, course_id):
+    def fail(description, plan):
+        raise ValueError("upstream outage")
+
+    monkeypatch.setattr(summary, "generate_course_summary_variants_sync", fail)
+    lock_key = variants_lock_key(course_id, "digest-from-api")
+    redis.set(lock_key, "pending")
+
+    summary.generate_and_store_variants(course_id, "digest-from-api", attempt=2)
+
+    marker = redis.values[lock_key]
+    assert marker.startswith(VARIANTS_FAILED)
+    attempts, retry_in = parse_variants_failure(marker)
+    assert attempts == 2
+    assert retry_in > 0
+
+
+def test_missing_course_releases_the_api_lock(redis):
+    course_id = uuid.uuid4()
+    lock_key = variants_lock_key(course_id, "digest-from-api")
+    redis.set(lock_key, "pending")
+
+    summary.generate_and_store_variants(course_id, "digest-from-api")
+
+    assert lock_key not in redis.values
+
+
+DESCRIPTION = "Learn Python."
+
+
+@pytest.fixture
+def variants_route(monkeypatch, client, async_redis):
+    """Record admission checks, quota charges and published attempts."""
+    calls = {"admitted": 0, "charged": 0, "published": []}
+
+    async def check_admission(priority="interactive"):
+        calls["admitted"] += 1
+        return 0.0
+
+    async def check_throttle(user_id, amount=1):
+        calls["charged"] += 1
+
+    async def record_stats(user_id, delta):
+        pass
+
+    monkeypatch.setattr(courses, "check_admission", check_admission)
+    monkeypatch.setattr(courses, "check_throttle", check_throttle)
+    monkeypatch.setattr(courses, "record_stats", record_stats)
+    monkeypatch.setattr(
+        courses.generate_summary_variants_task,
+        "apply_async",
+        lambda args, headers: calls["published"].append(args[3]),
+    )
+    course_id = client.post(
+        "/courses",
+        json={"course_title": "Python", "course_description": DESCRIPTION},
+    ).json()["id"]
+    calls["lock_key"] = variants_lock_key(course_id, description_hash(DESCRIPTION))
+    calls["url"] = f"/courses/{course_id}/summaries/one_liner"
+    return calls
+
+
+def failed_marker(attempts: int, retry_at: float) -> str:
+    return f"{VARIANTS_FAILED}:{attempts}:{retry_at}"
+
+
+def test_new_generation_is_admitted_and_charged(client, async_redis, variants_route):
+    response = client.get(variants_route["url"])
+    again = client.get(variants_route["url"])
+
+    assert response.status_code == again.status_code == 202
+    assert variants_route["published"] == [1]
+    assert variants_route["admitted"] == variants_route["charged"] == 1
+    assert async_redis.values[variants_route["lock_key"]] == VARIANTS_PENDING
+
+
+def test_overloaded_queue_releases_the_lock(
+    monkeypatch, client, async_redis, variants_route
+):
+    async def check_admission(priority="interactive"):
+        raise HTTPException(status_code=503, detail="Overloaded")
+
+    monkeypatch.setattr(courses, "check_admission", check_admission)
+
+    response = client.get(variants_route["url"])
+
+    assert response.status_code == 503
+    assert variants_route["lock_key"] not in async_redis.values
+    assert variants_route["charged"] == 0
+
+
+def test_failed_generation_waits_for_its_retry_delay(
+    client, async_redis, variants_route
+):
+    async_redis.values[variants_route["lock_key"]] = failed_marker(1, time.time() + 30)
+
+    response = client.get(variants_route["url"])
+
+    assert response.status_code == 503
+    assert 0 < int(response.headers["Retry-After"]) <= 30
+    assert variants_route["published"] == []
+
+
+def test_retry_within_the_charged_attempts_is_free(client, async_redis, variants_route):
+    async_redis.values[variants_route["lock_key"]] = failed_marker(1, time.time() - 1)
+
+    response = client.get(variants_route["url"])
+
+    assert response.status_code == 202
+    assert variants_route["published"] == [2]
+    assert variants_route["charged"] == 0
+
+
+def test_retry_after_the_charged_attempts_is_charged_again(
+    client, async_redis, variants_route
+):
+    lock_key = variants_route["lock_key"]
+    async_redis.values[lock_key] = failed_marker(
+        VARIANTS_ATTEMPTS_PER_CHARGE, time.time() - 1
+    )
+
+    response = client.get(variants_route["url"])
+
+    assert response.status_code == 202
+    assert variants_route["published"] == [1]
+    assert variants_route["charged"] == 1
+
+
+def test_refused_charge_keeps_the_failure_marker(
+    monkeypatch, client, async_redis, variants_route
+):
+    async def check_throttle(user_id, amount=1):
+        raise HTTPException(status_code=429, detail="Quota exhausted")
+
+    monkeypatch.setattr(courses, "check_throttle", check_throttle)
+    marker = failed_marker(VARIANTS_ATTEMPTS_PER_CHARGE, time.time() - 1)
+    async_redis.values[variants_route["lock_key"]] = marker
+
+    response = client.get(variants_route["url"])
+
+    assert response.status_code == 429
+    assert async_redis.values[variants_route["lock_key"]] == marker
+    assert variants_route["published"] == []
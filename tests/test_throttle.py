@@ -0,0 +1,53 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import throttle
+
+
+def test_usage_follows_the_throttle_window():
+    user_id = str(uuid.uuid4())
+
+    asyncio.run(throttle.check_throttle(user_id, amount=2))
+
+    assert asyncio.run(throttle.get_throttle_usage(user_id)) == 2
+    assert asyncio.run(throttle.get_remaining_quota(user_id)) == 1
+
+
+def test_charge_over_the_limit_is_rejected():
+    user_id = str(uuid.uuid4())
+    asyncio.run(throttle.check_throttle(user_id, amount=throttle.rate_limit.amount))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(throttle.check_throttle(user_id))
+
+    assert error.value.status_code == 429
+    assert asyncio.run(throttle.get_remaining_quota(user_id)) == 0
+
+
+def test_stats_report_usage_and_remaining_from_one_window(monkeypatch, client, user):
+    async def get_user_counters(db, user_id):
+        return {"courses": 0}
+
+    monkeypatch.setattr("app.routes.users.get_user_counters", get_user_counters)
+    asyncio.run(throttle.check_throttle(str(user.id), amount=2))
+
+    stats = client.get("/users/me/stats").json()
+
+    assert stats["summaries_used_today"] == 2
+    assert stats["summaries_remaining"] == 1
+    assert stats["daily_summary_limit"] == 3
+
+
+def test_batch_larger_than_remaining_quota_is_rejected(client, user):
+    asyncio.run(throttle.check_throttle(str(user.id), amount=2))
+
+    response = client.post(
+        "/generate_summary/batch",
+        json={"course_ids": [str(uuid.uuid4()), str(uuid.uuid4())]},
+    )
+
+    assert response.status_code == 429
+    assert "only 1 of your daily limit of 3 remain" in response.json()["detail"]
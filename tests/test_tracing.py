@@ -0,0 +1,52 @@
+from app.routes import courses
+from app.utils.tracing import (
+    TRACEPARENT_HEADER,
+    BufferedSpanExporter,
+    ConsoleSpanExporter,
+    extract,
+)
+
+
+def test_variants_task_continues_the_request_trace(
+    monkeypatch, client, async_redis, spans
+):
+    published = []
+
+    async def record_stats(user_id, delta):
+        pass
+
+    async def check_throttle(user_id, amount=1):
+        pass
+
+    async def check_admission(priority="interactive"):
+        return 0.0
+
+    monkeypatch.setattr(courses, "record_stats", record_stats)
+    monkeypatch.setattr(courses, "check_throttle", check_throttle)
+    monkeypatch.setattr(courses, "check_admission", check_admission)
+    monkeypatch.setattr(
+        courses.generate_summary_variants_task,
+        "apply_async",
+        lambda args, headers: published.append(headers),
+    )
+    course_id = client.post(
+        "/courses",
+        json={"course_title": "Python", "course_description": "Learn Python."},
+    ).json()["id"]
+
+    response = client.get(f"/courses/{course_id}/summaries/one_liner")
+
+    assert response.status_code == 202
+    (request_span,) = [s for s in spans if s.name.startswith("GET /courses")]
+    trace_id, _ = extract(published[0][TRACEPARENT_HEADER])
+    assert trace_id == request_span.trace_id
+
+
+def test_forked_exporter_gets_a_fresh_lock():
+    exporter = BufferedSpanExporter(ConsoleSpanExporter(), interval=60)
+    exporter._lock.acquire()
+
+    exporter._start()
+
+    assert exporter._lock.acquire(blocking=False)
+    exporter._lock.release()